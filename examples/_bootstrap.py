@@ -0,0 +1,34 @@
+"""
+Shared startup for the Purdue GenAI / OpenClaw example scripts.
+
+Loads .env and initializes AgentOps at most once per process, so scripts that
+are run or imported together do not each re-parse .env and start a client.
+"""
+
+import functools
+import os
+
+from dotenv import load_dotenv
+
+
+@functools.lru_cache(maxsize=1)
+def get_agentops():
+    """Load .env and initialize AgentOps once
+
+    Returns the agentops module, or None when agentops is not installed,
+    AGENTOPS_API_KEY is not set or AGENTOPS_DISABLED=1 (e.g. for benchmark
+    runs that should not pay the tracing overhead). To keep session tracking
+    but skip per-call LLM instrumentation, set AGENTOPS_INSTRUMENT_LLM_CALLS=false.
+    """
+    load_dotenv()
+    api_key = os.getenv("AGENTOPS_API_KEY")
+    if not api_key or os.getenv("AGENTOPS_DISABLED") == "1":
+        return None
+
+    try:
+        import agentops
+    except ImportError:
+        return None
+
+    agentops.init(api_key)
+    return agentops
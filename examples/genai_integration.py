@@ -1,12 +1,21 @@
 ﻿import os
 import requests
-import agentops
-from dotenv import load_dotenv
+try:
+    from ._bootstrap import get_agentops
+except ImportError:
+    from _bootstrap import get_agentops
 
-load_dotenv()
-agentops.init(os.getenv("AGENTOPS_API_KEY"))
 
-API_KEY = os.getenv("PURDUE_GENAI_API_KEY")
-headers = {"Authorization": f"Bearer {API_KEY}"}
-payload = {"model": "llama3.2:latest", "messages": [{"role": "user", "content": "Hello!"}]}
-response = requests.post("https://genai.rcac.purdue.edu/api/v1/chat/completions", headers=headers, json=payload)
+def main():
+    get_agentops()
+
+    API_KEY = os.getenv("PURDUE_GENAI_API_KEY")
+    headers = {"Authorization": f"Bearer {API_KEY}"}
+    payload = {"model": "llama3.2:latest", "messages": [{"role": "user", "content": "Hello!"}]}
+    response = requests.post("https://genai.rcac.purdue.edu/api/v1/chat/completions", headers=headers, json=payload)
+    response.raise_for_status()
+    print(response.json()["choices"][0]["message"]["content"])
+
+
+if __name__ == "__main__":
+    main()
@@ -6,36 +6,102 @@ Purdue GenAI Studio API as the LLM backend, monitored by AgentOps.
 """
 
 import os
-import requests
+import sys
+import time
+import random
+import asyncio
+import hashlib
+import importlib.util
+import itertools
+import httpx
 import json
-from dotenv import load_dotenv
-from typing import Dict, List, Optional
+import queue
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from email.utils import parsedate_to_datetime
+from functools import cached_property
+from concurrent.futures import ThreadPoolExecutor
+# Relative when imported as examples.<module>, top-level when run as a script from examples/
+try:
+    from ._bootstrap import get_agentops
+except ImportError:
+    from _bootstrap import get_agentops
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
-# Try to import agentops (optional)
+# orjson parses LLM responses and serializes request bodies several times faster than json (optional)
 try:
-    import agentops
-    AGENTOPS_AVAILABLE = True
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
 except ImportError:
-    AGENTOPS_AVAILABLE = False
-    print("Note: AgentOps not installed. Monitoring disabled.")
+    _json_loads = json.loads
 
-# Load environment variables
-load_dotenv()
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
 
-# Initialize AgentOps if available
-if AGENTOPS_AVAILABLE:
-    AGENTOPS_API_KEY = os.getenv("AGENTOPS_API_KEY")
-    if AGENTOPS_API_KEY:
-        agentops.init(AGENTOPS_API_KEY)
-        print("âœ“ AgentOps initialized")
-    else:
-        print("Note: AGENTOPS_API_KEY not found. Monitoring disabled.")
+# Optional backends for ResponseCache; sentence-transformers is imported on first use
+try:
+    import numpy as np
+    SEMANTIC_CACHE_AVAILABLE = importlib.util.find_spec("sentence_transformers") is not None
+except ImportError:
+    SEMANTIC_CACHE_AVAILABLE = False
 
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
 
-class PurdueGenAIProvider:
-    """Purdue GenAI Studio API provider for OpenClaw"""
+# Transient failures worth retrying: rate limiting and gateway/server errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_RETRIES = 3
+RETRY_BACKOFF_FACTOR = 0.5
+# Longest Retry-After worth waiting for; past this the error is returned instead
+MAX_RETRY_AFTER = 60
+
+
+def _retry_delay(attempt: int, response: httpx.Response) -> Optional[float]:
+    """Seconds to wait before retrying: the server's Retry-After if given, else backoff with full jitter
     
-    def __init__(self, api_key: str, base_url: str = None, model: str = None):
+    Returns None when Retry-After exceeds MAX_RETRY_AFTER, meaning do not retry.
+    """
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        try:
+            delay = max(float(retry_after), 0.0)
+        except ValueError:
+            try:
+                delay = max(parsedate_to_datetime(retry_after).timestamp() - time.time(), 0.0)
+            except (TypeError, ValueError):
+                delay = None
+        if delay is not None:
+            return delay if delay <= MAX_RETRY_AFTER else None
+    return random.uniform(0, RETRY_BACKOFF_FACTOR * (2 ** attempt))
+
+
+def _apply_prompt_cache_key(payload: Dict, prompt_cache_key: Optional[str]) -> Optional[Dict]:
+    """Tag payload so the server can reuse its KV cache across requests sharing a prompt prefix
+    
+    Sets both the OpenAI (prompt_cache_key) and llama.cpp/Ollama (cache_prompt)
+    fields; servers ignore the ones they do not know. Returns the extra headers
+    to send, or None when no key is given.
+    """
+    if not prompt_cache_key:
+        return None
+    payload["prompt_cache_key"] = prompt_cache_key
+    payload["cache_prompt"] = True
+    return {"X-Prompt-Cache-Id": prompt_cache_key}
+
+
+class _PurdueGenAIProviderBase(ABC):
+    """Configuration and request building shared by the sync and async providers
+    
+    Subclasses only supply the HTTP client (_create_client) and the
+    transport-specific send. Pass transport to replace the default HTTP/2
+    transport, e.g. with an httpx.MockTransport in tests.
+    """
+    
+    def __init__(self, api_key: str, base_url: str = None, model: str = None, transport=None):
         self.api_key = api_key
         self.base_url = base_url or "https://genai.rcac.purdue.edu/api/v1"
         self.model = model or "llama3.2:latest"
@@ -43,99 +109,652 @@ class PurdueGenAIProvider:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
-    
-    def chat_completion(self, messages: List[Dict], max_tokens: int = 1000, temperature: float = 0.7) -> Dict:
-        """Make a chat completion request to Purdue GenAI Studio"""
-        payload = {
-            "model": self.model,
-            "messages": messages,
-            "max_tokens": max_tokens,
-            "temperature": temperature
-        }
         
-        response = requests.post(
-            f"{self.base_url}/chat/completions",
-            headers=self.headers,
-            json=payload,
-            timeout=30
-        )
+        # Endpoint URLs and the static part of the payload are fixed per provider, so build them once
+        self._chat_url = f"{self.base_url}/chat/completions"
+        self._models_url = f"{self.base_url}/models"
+        self._payload_template = {"model": self.model}
+        
+        self._client = self._create_client(transport)
+    
+    @abstractmethod
+    def _create_client(self, transport):
+        """Return the httpx client requests are built and sent with"""
+    
+    def _chat_request(
+        self,
+        messages: List[Dict],
+        max_tokens: int,
+        temperature: float,
+        prompt_cache_key: Optional[str],
+        stream: bool = False
+    ) -> httpx.Request:
+        """Build the chat completion request"""
+        payload = self._payload_template.copy()
+        payload.update(messages=messages, max_tokens=max_tokens, temperature=temperature)
+        if stream:
+            payload["stream"] = True
+        headers = _apply_prompt_cache_key(payload, prompt_cache_key)
         
+        return self._client.build_request("POST", self._chat_url, content=_json_dumps(payload), headers=headers)
+    
+    @staticmethod
+    def _parse_completion(response: httpx.Response) -> Dict:
         if response.status_code == 200:
-            return response.json()
+            return _json_loads(response.content)
         else:
             raise Exception(f"API Error: {response.status_code} - {response.text}")
+
+
+class PurdueGenAIProvider(_PurdueGenAIProviderBase):
+    """Purdue GenAI Studio API provider for OpenClaw"""
+    
+    # list_models results change rarely, so they are cached on disk (needs diskcache)
+    MODELS_CACHE_DIR = "~/.cache/purdue_genai_models"
+    MODELS_CACHE_TTL = 86400
     
-    def list_models(self) -> List[str]:
-        """List available models"""
-        response = requests.get(
-            f"{self.base_url}/models",
+    def _create_client(self, transport) -> httpx.Client:
+        # One HTTP/2 client per provider: concurrent requests multiplex over a
+        # single kept-alive TLS connection instead of opening one each
+        return httpx.Client(
             headers=self.headers,
-            timeout=10
+            timeout=30,
+            transport=transport or httpx.HTTPTransport(
+                http2=True,
+                retries=3,
+                limits=httpx.Limits(max_keepalive_connections=8, max_connections=32)
+            )
+        )
+    
+    def _send(self, request: httpx.Request, stream: bool = False) -> httpx.Response:
+        """Send request, retrying transient status codes up to MAX_RETRIES times"""
+        for attempt in range(MAX_RETRIES + 1):
+            response = self._client.send(request, stream=stream)
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return response
+            delay = _retry_delay(attempt, response)
+            if delay is None:
+                return response
+            response.close()
+            time.sleep(delay)
+    
+    def chat_completion(
+        self,
+        messages: List[Dict],
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        prompt_cache_key: Optional[str] = None
+    ) -> Dict:
+        """Make a chat completion request to Purdue GenAI Studio"""
+        return self._parse_completion(
+            self._send(self._chat_request(messages, max_tokens, temperature, prompt_cache_key))
         )
+    
+    def chat_completion_stream(
+        self,
+        messages: List[Dict],
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        prompt_cache_key: Optional[str] = None
+    ) -> Iterator[str]:
+        """Make a streaming chat completion request, yielding content deltas as they arrive"""
+        # Retries happen before the first chunk is read, so no content is ever repeated
+        request = self._chat_request(messages, max_tokens, temperature, prompt_cache_key, stream=True)
+        response = self._send(request, stream=True)
+        try:
+            if response.status_code != 200:
+                response.read()
+                raise Exception(f"API Error: {response.status_code} - {response.text}")
+            
+            # Server-sent events: "data: {json}" lines (the space after the colon
+            # is optional), terminated by "data: [DONE]"
+            for line in response.iter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].lstrip()
+                if data == "[DONE]":
+                    break
+                # Usage-only chunks (stream_options.include_usage) have no choices
+                choices = _json_loads(data).get("choices")
+                if not choices:
+                    continue
+                content = choices[0].get("delta", {}).get("content")
+                if content:
+                    yield content
+        finally:
+            response.close()
+    
+    def list_models(self, force_refresh: bool = False) -> List[str]:
+        """List available models, served from the on-disk cache unless force_refresh is set"""
+        cache_key = f"{self.base_url}:{self.api_key[:8]}"
+        if DISKCACHE_AVAILABLE and not force_refresh:
+            with diskcache.Cache(os.path.expanduser(self.MODELS_CACHE_DIR)) as cache:
+                model_ids = cache.get(cache_key)
+            if model_ids is not None:
+                return model_ids
+        
+        response = self._send(self._client.build_request("GET", self._models_url, timeout=10))
         
         if response.status_code == 200:
-            models = response.json()["data"]
-            return [model["id"] for model in models]
+            models = _json_loads(response.content)["data"]
+            model_ids = [model["id"] for model in models]
         else:
             raise Exception(f"API Error: {response.status_code}")
+        
+        if DISKCACHE_AVAILABLE:
+            with diskcache.Cache(os.path.expanduser(self.MODELS_CACHE_DIR)) as cache:
+                cache.set(cache_key, model_ids, expire=self.MODELS_CACHE_TTL)
+        return model_ids
+    
+    @cached_property
+    def models(self) -> List[str]:
+        """Available models, fetched on first access and kept for the provider's lifetime"""
+        return self.list_models()
+    
+    def close(self):
+        """Close the underlying HTTP client"""
+        self._client.close()
+
+
+class AsyncPurdueGenAIProvider(_PurdueGenAIProviderBase):
+    """Async Purdue GenAI Studio API provider for concurrent chat completions"""
+    
+    def _create_client(self, transport) -> httpx.AsyncClient:
+        # One client per provider so concurrent requests share pooled connections
+        return httpx.AsyncClient(
+            headers=self.headers,
+            timeout=30,
+            transport=transport or httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=3,
+                limits=httpx.Limits(max_keepalive_connections=16, max_connections=32)
+            )
+        )
+    
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        """Send request, retrying transient status codes up to MAX_RETRIES times"""
+        for attempt in range(MAX_RETRIES + 1):
+            response = await self._client.send(request)
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return response
+            delay = _retry_delay(attempt, response)
+            if delay is None:
+                return response
+            await response.aclose()
+            await asyncio.sleep(delay)
+    
+    async def chat_completion(
+        self,
+        messages: List[Dict],
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        prompt_cache_key: Optional[str] = None
+    ) -> Dict:
+        """Make a chat completion request to Purdue GenAI Studio"""
+        return self._parse_completion(
+            await self._send(self._chat_request(messages, max_tokens, temperature, prompt_cache_key))
+        )
+    
+    async def aclose(self):
+        """Close the underlying HTTP client"""
+        await self._client.aclose()
+
+
+class ResponseCache:
+    """Two-tier cache of assistant responses for OpenClawAgent
+    
+    The exact tier is keyed by a hash of the full request and only used for
+    deterministic (temperature 0) calls. It is stored on disk when diskcache is
+    installed and a directory is given, otherwise in memory. The semantic tier
+    embeds the user input and returns a cached response for a sufficiently
+    similar question asked against the same model and max_tokens and the same
+    preceding conversation (system prompt, summary and earlier turns). It needs
+    numpy and sentence-transformers. Embeddings are stored quantized to uint8,
+    a quarter of the float32 footprint.
+    
+    Entries expire after ttl seconds. The in-memory tiers keep at most
+    max_entries each and evict the least recently used; the on-disk exact tier
+    is bounded by disk_size_limit bytes, past which diskcache culls the least
+    recently used entries.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 3600,
+        similarity_threshold: float = 0.92,
+        embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2",
+        directory: str = None,
+        disk_size_limit: int = 64 * 1024 * 1024
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        self.embedding_model = embedding_model
+        
+        if directory and DISKCACHE_AVAILABLE:
+            self._exact = diskcache.Cache(
+                os.path.expanduser(directory),
+                eviction_policy="least-recently-used",
+                size_limit=disk_size_limit
+            )
+        else:
+            self._exact = OrderedDict()
+        
+        # Semantic tier: a preallocated (max_entries, dim) uint8 matrix, allocated on the
+        # first insert once dim is known. _entries[i] holds slot i's metadata (None when
+        # free); only slots below _high have ever been used, and freed ones are reused
+        self._encoder = None
+        self._embeddings = None
+        self._entries = [None] * max_entries
+        self._free_slots = []
+        self._high = 0
+    
+    @staticmethod
+    def _hash(data) -> str:
+        return hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+    
+    def _scope(self, model: str, messages: List[Dict], max_tokens: int) -> str:
+        """Semantic matches are only valid for the same model, max_tokens and everything before the new user message
+        
+        A follow-up like "What are its main features?" means something different
+        after each conversation, so earlier turns are part of the scope. A reply
+        cut short by a small max_tokens must not answer a request allowing more.
+        """
+        return self._hash({"model": model, "max_tokens": max_tokens, "context": messages[:-1]})
+    
+    def embed(self, text: str):
+        """Embed text for the semantic tier, or return None when that tier is unavailable
+        
+        Computed once per turn by the caller and passed to both get() and set().
+        """
+        if not SEMANTIC_CACHE_AVAILABLE:
+            return None
+        if self._encoder is None:
+            from sentence_transformers import SentenceTransformer
+            self._encoder = SentenceTransformer(self.embedding_model)
+        return self._encoder.encode(text, normalize_embeddings=True).astype(np.float32)
+    
+    @staticmethod
+    def _quantize(embedding):
+        """Map an L2-normalized float32 embedding onto uint8 (value * 127 + 128)"""
+        return np.round(embedding * 127 + 128).astype(np.uint8)
+    
+    @staticmethod
+    def _dequantize(embeddings):
+        return (embeddings.astype(np.int16) - 128).astype(np.float32) * (1 / 127.0)
+    
+    def get(self, model: str, messages: List[Dict], embedding, max_tokens: int, temperature: float) -> Optional[str]:
+        """Return a cached response for this request, or None on a miss"""
+        if temperature == 0:
+            response = self._get_exact(self._hash({
+                "model": model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens
+            }))
+            if response is not None:
+                return response
+        
+        if embedding is not None:
+            return self._get_similar(self._scope(model, messages, max_tokens), embedding)
+        return None
+    
+    def set(self, model: str, messages: List[Dict], embedding, max_tokens: int, temperature: float, response: str):
+        """Store a response for this request"""
+        if temperature == 0:
+            self._set_exact(self._hash({
+                "model": model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens
+            }), response)
+        
+        if embedding is not None:
+            self._set_similar(self._scope(model, messages, max_tokens), embedding, response)
+    
+    def _get_exact(self, key: str) -> Optional[str]:
+        if not isinstance(self._exact, OrderedDict):
+            return self._exact.get(key)
+        
+        entry = self._exact.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at < time.monotonic():
+            del self._exact[key]
+            return None
+        self._exact.move_to_end(key)
+        return response
+    
+    def _set_exact(self, key: str, response: str):
+        if not isinstance(self._exact, OrderedDict):
+            self._exact.set(key, response, expire=self.ttl)
+            return
+        
+        self._exact[key] = (time.monotonic() + self.ttl, response)
+        self._exact.move_to_end(key)
+        while len(self._exact) > self.max_entries:
+            self._exact.popitem(last=False)
+    
+    def _get_similar(self, scope: str, embedding) -> Optional[str]:
+        self._evict_expired()
+        if len(self._free_slots) == self._high:
+            return None
+        
+        scores = self._dequantize(self._embeddings[:self._high]) @ embedding
+        scores[[entry is None or entry["scope"] != scope for entry in self._entries[:self._high]]] = -1.0
+        best = int(np.argmax(scores))
+        if scores[best] <= self.similarity_threshold:
+            return None
+        
+        self._entries[best]["last_used"] = time.monotonic()
+        return self._entries[best]["response"]
+    
+    def _set_similar(self, scope: str, embedding, response: str):
+        self._evict_expired()
+        if self._embeddings is None:
+            self._embeddings = np.empty((self.max_entries, embedding.shape[0]), dtype=np.uint8)
+        
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        elif self._high < self.max_entries:
+            slot = self._high
+            self._high += 1
+        else:
+            slot = min(range(self._high), key=lambda i: self._entries[i]["last_used"])
+        
+        self._embeddings[slot] = self._quantize(embedding)
+        now = time.monotonic()
+        self._entries[slot] = {
+            "scope": scope,
+            "response": response,
+            "expires_at": now + self.ttl,
+            "last_used": now
+        }
+    
+    def _evict_expired(self):
+        now = time.monotonic()
+        for slot in range(self._high):
+            entry = self._entries[slot]
+            if entry is not None and entry["expires_at"] < now:
+                self._entries[slot] = None
+                self._free_slots.append(slot)
 
 
 class OpenClawAgent:
-    """OpenClaw agent using Purdue GenAI Studio as LLM backend"""
+    """OpenClaw agent using Purdue GenAI Studio as LLM backend
+    
+    conversation_history holds the user and assistant turns in a deque capped
+    at max_history_messages; the system prompt and any summary of earlier
+    turns are kept alongside it. Before a turn would overflow the deque or
+    max_history_chars, everything but the most recent keep_recent_messages
+    (fewer if they alone exceed half of max_history_chars) is folded into a
+    single summary message.
+    """
     
-    def __init__(self, name: str, genai_provider: PurdueGenAIProvider, system_prompt: str = None):
+    SUMMARY_PREFIX = "Prior-conversation summary: "
+    
+    def __init__(
+        self,
+        name: str,
+        genai_provider: PurdueGenAIProvider,
+        system_prompt: str = None,
+        response_cache: Optional[ResponseCache] = None,
+        max_history_messages: int = 40,
+        max_history_chars: int = 16000,
+        keep_recent_messages: int = 20
+    ):
         self.name = name
         self.genai_provider = genai_provider
+        self.response_cache = response_cache
+        self.max_history_messages = max_history_messages
+        self.max_history_chars = max_history_chars
+        self.keep_recent_messages = keep_recent_messages
         self.system_prompt = system_prompt or "You are a helpful AI assistant."
-        self.conversation_history = []
-        if system_prompt:
-            self.conversation_history.append({
-                "role": "system",
-                "content": system_prompt
-            })
+        self._system_message = {"role": "system", "content": system_prompt} if system_prompt else None
+        self._summary_message = None
+        self.conversation_history = deque(maxlen=max_history_messages)
+        
+        # Agents with the same name and system prompt share a prompt prefix, so they share a cache key
+        self._prompt_cache_key = hashlib.sha256(f"{self.name}\n{self.system_prompt}".encode("utf-8")).hexdigest()[:32]
     
     def process(self, user_input: str, max_tokens: int = 1000, temperature: float = 0.7) -> str:
         """Process user input and return response"""
+        # Keep the prompt size bounded before it is sent or used as a cache key
+        self._truncate_history(user_input)
+        
         # Add user message to history
         self.conversation_history.append({
             "role": "user",
             "content": user_input
         })
         
-        # Get response from GenAI
         try:
+            # Serve repeated or near-identical questions without calling the LLM
+            embedding = self._cache_embedding(user_input)
+            cached = self._cached_response(embedding, max_tokens, temperature)
+            if cached is not None:
+                return self._append_assistant(cached)
+            
+            # Get response from GenAI
             result = self.genai_provider.chat_completion(
-                messages=self.conversation_history,
+                messages=self._messages(),
                 max_tokens=max_tokens,
-                temperature=temperature
+                temperature=temperature,
+                prompt_cache_key=self._prompt_cache_key
             )
             
-            # Extract response
-            assistant_message = result["choices"][0]["message"]["content"]
+            return self._record_response(self._extract_content(result), embedding, max_tokens, temperature)
+            
+        except Exception as e:
+            return f"Error: {str(e)}"
+    
+    def process_stream(self, user_input: str, max_tokens: int = 1000, temperature: float = 0.7) -> Iterator[str]:
+        """Process user input, yielding the response in chunks as it is generated"""
+        self._truncate_history(user_input)
+        
+        self.conversation_history.append({
+            "role": "user",
+            "content": user_input
+        })
+        
+        # History is only updated once the stream has completed
+        chunks = []
+        try:
+            embedding = self._cache_embedding(user_input)
+            cached = self._cached_response(embedding, max_tokens, temperature)
+            if cached is not None:
+                yield self._append_assistant(cached)
+                return
+            
+            for chunk in self.genai_provider.chat_completion_stream(
+                messages=self._messages(),
+                max_tokens=max_tokens,
+                temperature=temperature,
+                prompt_cache_key=self._prompt_cache_key
+            ):
+                chunks.append(chunk)
+                yield chunk
+        except Exception as e:
+            yield f"Error: {str(e)}"
+            return
+        
+        self._record_response("".join(chunks), embedding, max_tokens, temperature)
+    
+    async def process_async(self, user_input: str, max_tokens: int = 1000, temperature: float = 0.7) -> str:
+        """Process user input with an AsyncPurdueGenAIProvider and return response"""
+        await self._truncate_history_async(user_input)
+        
+        self.conversation_history.append({
+            "role": "user",
+            "content": user_input
+        })
+        
+        try:
+            embedding = self._cache_embedding(user_input)
+            cached = self._cached_response(embedding, max_tokens, temperature)
+            if cached is not None:
+                return self._append_assistant(cached)
             
-            # Add to conversation history
-            self.conversation_history.append({
-                "role": "assistant",
-                "content": assistant_message
-            })
+            result = await self.genai_provider.chat_completion(
+                messages=self._messages(),
+                max_tokens=max_tokens,
+                temperature=temperature,
+                prompt_cache_key=self._prompt_cache_key
+            )
             
-            return assistant_message
+            return self._record_response(self._extract_content(result), embedding, max_tokens, temperature)
             
         except Exception as e:
             return f"Error: {str(e)}"
     
+    def _messages(self) -> List[Dict]:
+        """Messages sent to the provider: system prompt, summary, then the recent turns"""
+        return list(itertools.chain(
+            [self._system_message] if self._system_message else [],
+            [self._summary_message] if self._summary_message else [],
+            self.conversation_history
+        ))
+    
+    def _truncate_history(self, user_input: str):
+        """Summarize old messages before the coming turn would exceed the history bounds"""
+        old_messages = self._messages_to_summarize(user_input)
+        if not old_messages:
+            return
+        
+        summary = None
+        try:
+            summary = self._extract_content(self.genai_provider.chat_completion(
+                messages=self._summary_request(old_messages), max_tokens=400, temperature=0
+            ))
+        except Exception:
+            pass
+        self._replace_with_summary(old_messages, summary)
+    
+    async def _truncate_history_async(self, user_input: str):
+        """Async variant of _truncate_history for an AsyncPurdueGenAIProvider"""
+        old_messages = self._messages_to_summarize(user_input)
+        if not old_messages:
+            return
+        
+        summary = None
+        try:
+            summary = self._extract_content(await self.genai_provider.chat_completion(
+                messages=self._summary_request(old_messages), max_tokens=400, temperature=0
+            ))
+        except Exception:
+            pass
+        self._replace_with_summary(old_messages, summary)
+    
+    def _messages_to_summarize(self, user_input: str) -> List[Dict]:
+        """Return the oldest messages to fold into a summary, or [] while the coming turn fits"""
+        total_chars = len(user_input) + sum(len(message["content"]) for message in self.conversation_history)
+        if self._summary_message:
+            total_chars += len(self._summary_message["content"])
+        
+        # The turn adds a user and an assistant message; anything past maxlen would be dropped unsummarized
+        if len(self.conversation_history) + 2 <= self.max_history_messages and total_chars <= self.max_history_chars:
+            return []
+        
+        # Keep at most keep_recent_messages verbatim, and fewer if they would take more than
+        # half the character cap, so the next few turns fit again without re-summarizing
+        char_budget = self.max_history_chars // 2 - len(user_input)
+        kept = kept_chars = 0
+        for message in reversed(self.conversation_history):
+            if kept == self.keep_recent_messages or kept_chars + len(message["content"]) > char_budget:
+                break
+            kept += 1
+            kept_chars += len(message["content"])
+        
+        count = len(self.conversation_history) - kept
+        if not count:
+            return []
+        
+        # The previous summary is folded into the new one
+        old_messages = [self._summary_message] if self._summary_message else []
+        return old_messages + list(itertools.islice(self.conversation_history, count))
+    
+    def _summary_request(self, old_messages: List[Dict]) -> List[Dict]:
+        transcript = "\n".join(f"{message['role']}: {message['content']}" for message in old_messages)
+        return [
+            {
+                "role": "system",
+                "content": "Summarize this conversation in at most 300 tokens. Keep facts, decisions and open questions."
+            },
+            {"role": "user", "content": transcript}
+        ]
+    
+    @staticmethod
+    def _extract_content(result: Dict) -> str:
+        return result["choices"][0]["message"]["content"]
+    
+    def _replace_with_summary(self, old_messages: List[Dict], summary: Optional[str]):
+        """Swap old_messages for one summary message; drop them outright if summarizing failed"""
+        count = len(old_messages) - (1 if self._summary_message else 0)
+        for _ in range(count):
+            self.conversation_history.popleft()
+        
+        self._summary_message = {"role": "system", "content": self.SUMMARY_PREFIX + summary} if summary else None
+    
+    def _cache_embedding(self, user_input: str):
+        """Embed user_input once per turn for the response cache's semantic tier, if any"""
+        if self.response_cache is None:
+            return None
+        return self.response_cache.embed(user_input)
+    
+    def _cached_response(self, embedding, max_tokens: int, temperature: float) -> Optional[str]:
+        """Look up the pending request in the response cache, if one is configured"""
+        if self.response_cache is None:
+            return None
+        return self.response_cache.get(
+            self.genai_provider.model, self._messages(), embedding, max_tokens, temperature
+        )
+    
+    def _record_response(self, assistant_message: str, embedding, max_tokens: int, temperature: float) -> str:
+        """Cache the assistant message and add it to history"""
+        if self.response_cache is not None:
+            self.response_cache.set(
+                self.genai_provider.model, self._messages(), embedding, max_tokens, temperature,
+                assistant_message
+            )
+        
+        return self._append_assistant(assistant_message)
+    
+    def _append_assistant(self, assistant_message: str) -> str:
+        """Add an assistant message to history and return it"""
+        self.conversation_history.append({
+            "role": "assistant",
+            "content": assistant_message
+        })
+        
+        return assistant_message
+    
     def reset_conversation(self):
         """Reset conversation history"""
-        self.conversation_history = []
-        if self.system_prompt:
-            self.conversation_history.append({
-                "role": "system",
-                "content": self.system_prompt
-            })
+        self._summary_message = None
+        self.conversation_history.clear()
+
+
+async def process_many_async(pairs: Sequence[Tuple[OpenClawAgent, str]], **kwargs) -> List[str]:
+    """Run independent (agent, question) pairs concurrently, returning responses in input order"""
+    return await asyncio.gather(*[agent.process_async(question, **kwargs) for agent, question in pairs])
+
+
+def run_conversation(agent: OpenClawAgent, conversation: Sequence[Tuple[str, str, Dict]]) -> List[str]:
+    """Run (title, question, kwargs) turns through one agent in order, so follow-ups keep their context"""
+    return [agent.process(question, **kwargs) for _, question, kwargs in conversation]
 
 
 def main():
     """Main integration example"""
+    # Load environment variables and initialize AgentOps if available
+    agentops = get_agentops()
+    if agentops:
+        print("âœ“ AgentOps initialized")
+    else:
+        print("Note: AgentOps not installed, AGENTOPS_API_KEY not found or AGENTOPS_DISABLED=1. Monitoring disabled.")
+    
     print("=" * 60)
     print("OpenClaw + Purdue GenAI Studio Integration")
     print("=" * 60)
@@ -162,60 +781,82 @@ def main():
     )
     print("   âœ“ GenAI Provider initialized")
     
-    # List available models
     try:
-        models = genai_provider.list_models()
-        print(f"   âœ“ Available models: {len(models)}")
-    except Exception as e:
-        print(f"   âš  Could not list models: {e}")
-    
-    # Initialize OpenClaw agent
-    print("\n2. Initializing OpenClaw Agent...")
-    agent = OpenClawAgent(
-        name="Research Assistant",
-        genai_provider=genai_provider,
-        system_prompt="You are a helpful research assistant. Provide clear, concise, and accurate information."
-    )
-    print("   âœ“ OpenClaw Agent initialized")
-    
-    # Test interactions
-    print("\n3. Testing Agent Interactions...")
-    print("-" * 60)
-    
-    # Test 1: Simple question
-    print("\nTest 1: Simple Question")
-    question1 = "What is artificial intelligence?"
-    print(f"User: {question1}")
-    response1 = agent.process(question1, max_tokens=150)
-    print(f"Agent: {response1}")
-    
-    # Test 2: Follow-up question
-    print("\nTest 2: Follow-up Question")
-    question2 = "How does it differ from machine learning?"
-    print(f"User: {question2}")
-    response2 = agent.process(question2, max_tokens=200)
-    print(f"Agent: {response2}")
-    
-    # Test 3: Complex query
-    print("\nTest 3: Complex Query")
-    question3 = "Explain the main types of machine learning algorithms with examples."
-    print(f"User: {question3}")
-    response3 = agent.process(question3, max_tokens=300, temperature=0.7)
-    print(f"Agent: {response3}")
-    
-    print("\n" + "=" * 60)
-    print("Integration Test Complete!")
-    print("=" * 60)
-    print("âœ“ GenAI Provider: Working")
-    print("âœ“ OpenClaw Agent: Functional")
-    print("âœ“ Conversation History: Maintained")
-    if AGENTOPS_AVAILABLE and os.getenv("AGENTOPS_API_KEY"):
-        print("âœ“ AgentOps Monitoring: Active")
-    
-    # End AgentOps session
-    if AGENTOPS_AVAILABLE and os.getenv("AGENTOPS_API_KEY"):
-        agentops.end_session("Success")
-        print("âœ“ AgentOps session ended")
+        # List available models only when asked, so startup does not wait on the round-trip
+        if "--list-models" in sys.argv:
+            try:
+                print(f"   âœ“ Available models: {genai_provider.models}")
+            except Exception as e:
+                print(f"   âš  Could not list models: {e}")
+    
+        # Initialize OpenClaw agents
+        # Test 2 follows up on Test 1, so those two share an agent; Test 3 is
+        # independent, gets its own agent and is streamed while Tests 1-2 run
+        print("\n2. Initializing OpenClaw Agents...")
+        conversation = [
+            ("Test 1: Simple Question", "What is artificial intelligence?", {"max_tokens": 150}),
+            ("Test 2: Follow-up Question", "How does it differ from machine learning?", {"max_tokens": 200}),
+        ]
+        streamed_test = ("Test 3: Complex Query", "Explain the main types of machine learning algorithms with examples.",
+                         {"max_tokens": 300, "temperature": 0.7})
+        streaming_agent, conversation_agent = [
+            OpenClawAgent(
+                name="Research Assistant",
+                genai_provider=genai_provider,
+                system_prompt="You are a helpful research assistant. Provide clear, concise, and accurate information."
+            )
+            for _ in range(2)
+        ]
+        print("   âœ“ 2 OpenClaw Agents initialized")
+    
+        # Test interactions
+        print("\n3. Testing Agent Interactions...")
+        print("-" * 60)
+    
+        # Test 3 streams into a queue in the background so the output stays in
+        # order: chunks that arrived while Tests 1-2 ran are printed first, the
+        # rest as they come
+        title, question, kwargs = streamed_test
+        chunks = queue.Queue()
+    
+        def stream_test():
+            try:
+                for chunk in streaming_agent.process_stream(question, **kwargs):
+                    chunks.put(chunk)
+            finally:
+                chunks.put(None)
+    
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(stream_test)
+            responses = run_conversation(conversation_agent, conversation)
+    
+            for (conversation_title, conversation_question, _), response in zip(conversation, responses):
+                print(f"\n{conversation_title}")
+                print(f"User: {conversation_question}")
+                print(f"Agent: {response}")
+    
+            print(f"\n{title} (streaming)")
+            print(f"User: {question}")
+            print("Agent: ", end="", flush=True)
+            for chunk in iter(chunks.get, None):
+                print(chunk, end="", flush=True)
+            print()
+    
+        print("\n" + "=" * 60)
+        print("Integration Test Complete!")
+        print("=" * 60)
+        print("âœ“ GenAI Provider: Working")
+        print("âœ“ OpenClaw Agent: Functional")
+        print("âœ“ Conversation History: Maintained")
+        if agentops:
+            print("âœ“ AgentOps Monitoring: Active")
+    
+        # End AgentOps session
+        if agentops:
+            agentops.end_session("Success")
+            print("âœ“ AgentOps session ended")
+    finally:
+        genai_provider.close()
 
 
 if __name__ == "__main__":
@@ -1,10 +1,20 @@
 ﻿import os
-import agentops
-import openclaw
-from dotenv import load_dotenv
-
-load_dotenv()
-agentops.init(os.getenv('AGENTOPS_API_KEY'))
-claw = openclaw.initialize(api_key=os.getenv('OPENCLAW_API_KEY'))
-result = claw.process('Example task')
-agentops.end_session('Success')
+try:
+    from ._bootstrap import get_agentops
+except ImportError:
+    from _bootstrap import get_agentops
+
+
+def main():
+    import openclaw
+
+    agentops = get_agentops()
+    claw = openclaw.initialize(api_key=os.getenv('OPENCLAW_API_KEY'))
+    result = claw.process('Example task')
+    print(result)
+    if agentops:
+        agentops.end_session('Success')
+
+
+if __name__ == '__main__':
+    main()
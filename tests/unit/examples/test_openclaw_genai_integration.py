@@ -0,0 +1,404 @@
+"""Tests for the Purdue GenAI provider in examples/openclaw_genai_integration.py"""
+
+import json
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from examples import openclaw_genai_integration as integration  # noqa: E402
+
+
+def sse_body(*contents):
+    """Server-sent events body streaming contents as chat completion deltas"""
+    events = [f"data: {json.dumps({'choices': [{'delta': {'content': c}}]})}\n\n" for c in contents]
+    return "".join(events) + "data: [DONE]\n\n"
+
+
+def completion(content):
+    return {"choices": [{"message": {"role": "assistant", "content": content}}]}
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    """Skip retry backoff, recording the requested delays instead"""
+    delays = []
+    monkeypatch.setattr(integration.time, "sleep", delays.append)
+    return delays
+
+
+def make_provider(handler):
+    return integration.PurdueGenAIProvider(api_key="test-key", transport=httpx.MockTransport(handler))
+
+
+class TestChatCompletionStream:
+    def test_yields_content_deltas(self):
+        requests = []
+
+        def handler(request):
+            requests.append(json.loads(request.content))
+            return httpx.Response(200, text=sse_body("Hello", ", ", "world"))
+
+        provider = make_provider(handler)
+        assert list(provider.chat_completion_stream([{"role": "user", "content": "Hi"}])) == ["Hello", ", ", "world"]
+        assert requests[0]["stream"] is True
+
+    def test_accepts_data_lines_without_space(self):
+        body = sse_body("Hello", " world").replace("data: ", "data:")
+        provider = make_provider(lambda request: httpx.Response(200, text=body))
+
+        assert list(provider.chat_completion_stream([{"role": "user", "content": "Hi"}])) == ["Hello", " world"]
+
+    def test_skips_chunks_without_choices(self):
+        usage = json.dumps({"choices": [], "usage": {"prompt_tokens": 5, "completion_tokens": 2}})
+        body = sse_body("Hello", " there").replace("data: [DONE]", f"data: {usage}\n\ndata: [DONE]")
+        provider = make_provider(lambda request: httpx.Response(200, text=body))
+        agent = integration.OpenClawAgent(name="test", genai_provider=provider)
+
+        assert "".join(agent.process_stream("Hi")) == "Hello there"
+        assert list(agent.conversation_history)[-1] == {"role": "assistant", "content": "Hello there"}
+
+    def test_agent_process_stream_records_reply(self):
+        provider = make_provider(lambda request: httpx.Response(200, text=sse_body("Hello", " there")))
+        agent = integration.OpenClawAgent(name="test", genai_provider=provider)
+
+        assert "".join(agent.process_stream("Hi")) == "Hello there"
+        assert list(agent.conversation_history)[-1] == {"role": "assistant", "content": "Hello there"}
+
+    def test_error_status_raises(self):
+        provider = make_provider(lambda request: httpx.Response(400, text="bad request"))
+
+        with pytest.raises(Exception, match="API Error: 400 - bad request"):
+            list(provider.chat_completion_stream([{"role": "user", "content": "Hi"}]))
+
+    def test_retries_before_streaming(self, no_sleep):
+        statuses = iter([503, 200])
+
+        def handler(request):
+            status = next(statuses)
+            return httpx.Response(status, text=sse_body("ok") if status == 200 else "unavailable")
+
+        provider = make_provider(handler)
+        assert list(provider.chat_completion_stream([{"role": "user", "content": "Hi"}])) == ["ok"]
+        assert len(no_sleep) == 1
+
+
+class TestRetries:
+    def test_retries_transient_status(self, no_sleep):
+        statuses = iter([429, 502, 200])
+
+        def handler(request):
+            status = next(statuses)
+            return httpx.Response(status, json=completion("ok") if status == 200 else {})
+
+        provider = make_provider(handler)
+        result = provider.chat_completion([{"role": "user", "content": "Hi"}])
+        assert result["choices"][0]["message"]["content"] == "ok"
+        assert len(no_sleep) == 2
+
+    def test_gives_up_after_max_retries(self, no_sleep):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503, text="unavailable")
+
+        provider = make_provider(handler)
+        with pytest.raises(Exception, match="API Error: 503"):
+            provider.chat_completion([{"role": "user", "content": "Hi"}])
+        assert len(calls) == integration.MAX_RETRIES + 1
+
+    def test_does_not_retry_client_errors(self, no_sleep):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(400, text="bad request")
+
+        provider = make_provider(handler)
+        with pytest.raises(Exception, match="API Error: 400"):
+            provider.chat_completion([{"role": "user", "content": "Hi"}])
+        assert len(calls) == 1 and not no_sleep
+
+    def test_honours_retry_after(self, no_sleep):
+        statuses = iter([429, 200])
+
+        def handler(request):
+            status = next(statuses)
+            if status == 429:
+                return httpx.Response(429, headers={"Retry-After": "2"})
+            return httpx.Response(200, json=completion("ok"))
+
+        make_provider(handler).chat_completion([{"role": "user", "content": "Hi"}])
+        assert no_sleep == [2.0]
+
+    @pytest.mark.parametrize("retry_after", ["3600", "Wed, 21 Oct 2099 07:28:00 GMT"])
+    def test_returns_error_when_retry_after_exceeds_max(self, no_sleep, retry_after):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503, headers={"Retry-After": retry_after}, text="unavailable")
+
+        provider = make_provider(handler)
+        with pytest.raises(Exception, match="API Error: 503"):
+            provider.chat_completion([{"role": "user", "content": "Hi"}])
+        assert len(calls) == 1 and not no_sleep
+
+
+def unit_vector(*components, dim=8):
+    """L2-normalized float32 embedding built from its leading components"""
+    np = pytest.importorskip("numpy")
+    vector = np.zeros(dim, dtype=np.float32)
+    vector[: len(components)] = components
+    return vector / np.linalg.norm(vector)
+
+
+class TestResponseCache:
+    MESSAGES = [{"role": "system", "content": "Be brief."}, {"role": "user", "content": "What is AI?"}]
+
+    def test_semantic_tier_scoped_by_max_tokens(self):
+        cache = integration.ResponseCache()
+        embedding = unit_vector(1.0)
+        cache.set("model", self.MESSAGES, embedding, 150, 0.7, "Artificial intel")
+
+        assert cache.get("model", self.MESSAGES, embedding, 150, 0.7) == "Artificial intel"
+        assert cache.get("model", self.MESSAGES, embedding, 1000, 0.7) is None
+
+    def test_quantization_round_trip(self):
+        np = pytest.importorskip("numpy")
+        embedding = unit_vector(0.3, -0.5, 0.8, 0.1)
+        quantized = integration.ResponseCache._quantize(embedding)
+
+        assert quantized.dtype == np.uint8
+        assert np.abs(integration.ResponseCache._dequantize(quantized) - embedding).max() <= 0.5 / 127 + 1e-6
+
+    def test_similar_question_hits(self):
+        cache = integration.ResponseCache()
+        cache.set("model", self.MESSAGES, unit_vector(1.0, 0.1), 150, 0.7, "cached")
+
+        assert cache.get("model", self.MESSAGES, unit_vector(1.0, 0.15), 150, 0.7) == "cached"
+
+    def test_dissimilar_question_misses(self):
+        cache = integration.ResponseCache()
+        cache.set("model", self.MESSAGES, unit_vector(1.0, 0.0), 150, 0.7, "cached")
+
+        # cos(a, b) = 0.9, below the default 0.92 threshold
+        assert cache.get("model", self.MESSAGES, unit_vector(0.9, 0.19**0.5), 150, 0.7) is None
+
+    def test_semantic_tier_scoped_by_model_and_context(self):
+        cache = integration.ResponseCache()
+        embedding = unit_vector(1.0)
+        cache.set("model", self.MESSAGES, embedding, 150, 0.7, "cached")
+        other_context = [{"role": "system", "content": "Be verbose."}, self.MESSAGES[-1]]
+
+        assert cache.get("other-model", self.MESSAGES, embedding, 150, 0.7) is None
+        assert cache.get("model", other_context, embedding, 150, 0.7) is None
+
+    def test_expired_entries_free_their_slot(self, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(integration.time, "monotonic", lambda: clock[0])
+        cache = integration.ResponseCache(max_entries=2, ttl=60)
+        cache.set("model", self.MESSAGES, unit_vector(1.0), 150, 0.7, "first")
+        cache.set("model", self.MESSAGES, unit_vector(0.0, 1.0), 150, 0.7, "second")
+
+        clock[0] += 61
+        assert cache.get("model", self.MESSAGES, unit_vector(1.0), 150, 0.7) is None
+        assert sorted(cache._free_slots) == [0, 1]
+
+        cache.set("model", self.MESSAGES, unit_vector(0.0, 0.0, 1.0), 150, 0.7, "third")
+        assert cache._high == 2 and len(cache._free_slots) == 1
+        assert cache.get("model", self.MESSAGES, unit_vector(0.0, 0.0, 1.0), 150, 0.7) == "third"
+
+    def test_replaces_least_recently_used_when_full(self, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(integration.time, "monotonic", lambda: clock[0])
+        cache = integration.ResponseCache(max_entries=2)
+        first, second, third = unit_vector(1.0), unit_vector(0.0, 1.0), unit_vector(0.0, 0.0, 1.0)
+        cache.set("model", self.MESSAGES, first, 150, 0.7, "first")
+        clock[0] += 1
+        cache.set("model", self.MESSAGES, second, 150, 0.7, "second")
+        clock[0] += 1
+        assert cache.get("model", self.MESSAGES, first, 150, 0.7) == "first"
+
+        clock[0] += 1
+        cache.set("model", self.MESSAGES, third, 150, 0.7, "third")
+
+        assert cache.get("model", self.MESSAGES, second, 150, 0.7) is None
+        assert cache.get("model", self.MESSAGES, first, 150, 0.7) == "first"
+        assert cache.get("model", self.MESSAGES, third, 150, 0.7) == "third"
+
+    def test_exact_tier_only_for_temperature_zero(self):
+        cache = integration.ResponseCache()
+        cache.set("model", self.MESSAGES, None, 150, 0, "exact")
+        cache.set("model", self.MESSAGES, None, 150, 0.7, "sampled")
+
+        assert cache.get("model", self.MESSAGES, None, 150, 0) == "exact"
+        assert cache.get("model", self.MESSAGES, None, 150, 0.7) is None
+
+
+class TestOpenClawAgent:
+    def test_cache_embedding_failure_returns_error(self, monkeypatch):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json=completion("ok"))
+
+        cache = integration.ResponseCache()
+
+        def embed(text):
+            raise OSError("model not available offline")
+
+        monkeypatch.setattr(cache, "embed", embed)
+        agent = integration.OpenClawAgent(name="test", genai_provider=make_provider(handler), response_cache=cache)
+
+        assert agent.process("Hi") == "Error: model not available offline"
+        assert "".join(agent.process_stream("Hi")) == "Error: model not available offline"
+        assert not calls
+
+
+class TestAsyncProvider:
+    def test_base_class_is_abstract(self):
+        with pytest.raises(TypeError):
+            integration._PurdueGenAIProviderBase(api_key="test-key")
+
+    async def test_process_many_async_keeps_input_order(self):
+        def handler(request):
+            question = json.loads(request.content)["messages"][-1]["content"]
+            return httpx.Response(200, json=completion(f"answer to {question}"))
+
+        provider = integration.AsyncPurdueGenAIProvider(api_key="test-key", transport=httpx.MockTransport(handler))
+        agents = [integration.OpenClawAgent(name=f"agent {i}", genai_provider=provider) for i in range(3)]
+        try:
+            responses = await integration.process_many_async([(agent, f"Q{i}") for i, agent in enumerate(agents)])
+        finally:
+            await provider.aclose()
+
+        assert responses == ["answer to Q0", "answer to Q1", "answer to Q2"]
+        assert list(agents[1].conversation_history)[-1] == {"role": "assistant", "content": "answer to Q1"}
+
+    async def test_retries_transient_status(self, monkeypatch):
+        delays = []
+
+        async def sleep(delay):
+            delays.append(delay)
+
+        monkeypatch.setattr(integration.asyncio, "sleep", sleep)
+        statuses = iter([503, 200])
+
+        def handler(request):
+            status = next(statuses)
+            return httpx.Response(status, json=completion("ok") if status == 200 else {})
+
+        provider = integration.AsyncPurdueGenAIProvider(api_key="test-key", transport=httpx.MockTransport(handler))
+        try:
+            result = await provider.chat_completion([{"role": "user", "content": "Hi"}])
+        finally:
+            await provider.aclose()
+
+        assert result["choices"][0]["message"]["content"] == "ok"
+        assert len(delays) == 1
+
+
+class FakeServer:
+    """MockTransport handler answering chat turns with reply and summary requests with "summary N" """
+
+    def __init__(self, reply="ok", fail_summaries=False):
+        self.reply = reply
+        self.fail_summaries = fail_summaries
+        self.transcripts = []
+        self.prompts = []
+
+    def __call__(self, request):
+        messages = json.loads(request.content)["messages"]
+        if messages[0]["content"].startswith("Summarize this conversation"):
+            self.transcripts.append(messages[-1]["content"])
+            if self.fail_summaries:
+                return httpx.Response(400, text="bad request")
+            return httpx.Response(200, json=completion(f"summary {len(self.transcripts)}"))
+        self.prompts.append(messages)
+        return httpx.Response(200, json=completion(self.reply))
+
+
+class TestHistoryTruncation:
+    def make_agent(self, server, **kwargs):
+        return integration.OpenClawAgent(name="test", genai_provider=make_provider(server), **kwargs)
+
+    def test_summarizes_when_message_count_would_overflow(self):
+        server = FakeServer()
+        agent = self.make_agent(server, max_history_messages=6, keep_recent_messages=2)
+        for i in range(3):
+            agent.process(f"Q{i}")
+        assert not server.transcripts
+
+        agent.process("Q3")
+
+        assert server.transcripts == ["user: Q0\nassistant: ok\nuser: Q1\nassistant: ok"]
+        assert [m["content"] for m in agent.conversation_history] == ["Q2", "ok", "Q3", "ok"]
+        assert server.prompts[-1][0] == {"role": "system", "content": agent.SUMMARY_PREFIX + "summary 1"}
+
+    def test_summarizes_when_character_cap_would_be_exceeded(self):
+        server = FakeServer(reply="x" * 400)
+        agent = self.make_agent(server, max_history_chars=1000)
+        for i in range(3):
+            agent.process(f"Q{i}")
+        assert not server.transcripts
+
+        agent.process("Q3")
+
+        # The 20 most recent messages would not fit in half the cap, so only Q2 and its reply stay verbatim
+        assert len(server.transcripts) == 1
+        assert [m["content"] for m in agent.conversation_history] == ["Q2", "x" * 400, "Q3", "x" * 400]
+        assert sum(len(m["content"]) for m in server.prompts[-1]) <= 1000
+
+    def test_character_cap_holds_over_long_conversations(self):
+        server = FakeServer(reply="x" * 2000)
+        agent = self.make_agent(server, system_prompt="Be brief.", max_history_chars=16000)
+        for i in range(30):
+            agent.process(f"Question {i}")
+
+        assert all(sum(len(m["content"]) for m in prompt) <= 16000 for prompt in server.prompts)
+        assert len(server.transcripts) <= 10
+
+    def test_folds_previous_summary_into_the_next(self):
+        server = FakeServer()
+        agent = self.make_agent(server, max_history_messages=6, keep_recent_messages=2)
+        for i in range(6):
+            agent.process(f"Q{i}")
+
+        assert len(server.transcripts) == 2
+        assert server.transcripts[1].startswith(f"system: {agent.SUMMARY_PREFIX}summary 1\nuser: Q2")
+        summaries = [m for m in agent._messages() if m["content"].startswith(agent.SUMMARY_PREFIX)]
+        assert summaries == [{"role": "system", "content": agent.SUMMARY_PREFIX + "summary 2"}]
+
+    def test_drops_old_messages_when_summary_fails(self):
+        server = FakeServer(fail_summaries=True)
+        agent = self.make_agent(server, max_history_messages=6, keep_recent_messages=2)
+        for i in range(3):
+            agent.process(f"Q{i}")
+
+        assert agent.process("Q3") == "ok"
+
+        assert len(server.transcripts) == 1
+        assert agent._messages() == [
+            {"role": "user", "content": "Q2"},
+            {"role": "assistant", "content": "ok"},
+            {"role": "user", "content": "Q3"},
+            {"role": "assistant", "content": "ok"},
+        ]
+
+    async def test_async_variant_summarizes(self):
+        server = FakeServer()
+        provider = integration.AsyncPurdueGenAIProvider(api_key="test-key", transport=httpx.MockTransport(server))
+        agent = integration.OpenClawAgent(
+            name="test", genai_provider=provider, max_history_messages=6, keep_recent_messages=2
+        )
+        try:
+            for i in range(4):
+                await agent.process_async(f"Q{i}")
+        finally:
+            await provider.aclose()
+
+        assert server.transcripts == ["user: Q0\nassistant: ok\nuser: Q1\nassistant: ok"]
+        assert [m["content"] for m in agent.conversation_history] == ["Q2", "ok", "Q3", "ok"]